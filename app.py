@@ -7,13 +7,16 @@ from flask import Flask, render_template, jsonify, send_file, request
 from flask_socketio import SocketIO, emit
 import asyncio
 import json
+import orjson
 import csv
-import time
 import re
 import os
-import glob
+import functools
+import queue
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple, Optional
 from playwright.async_api import async_playwright, Request, Response
 import threading
 
@@ -21,73 +24,351 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
 
+def fast_json(obj, status: int = 200):
+    """Build a JSON response with orjson (used by endpoints returning large lists)"""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+# GraphQL endpoint detection (case-insensitive, without lowercasing a copy of the URL)
+_GQL_URL_RE = re.compile(r'graphql', re.IGNORECASE)
+_XHR_TYPES = frozenset({'fetch', 'xhr'})
+
+# Resource types captured by the request/response handlers
+_TRACKED_TYPES = frozenset({'fetch', 'xhr', 'script', 'document'})
+
+# Match pattern: query/mutation/subscription OperationName
+_OP_RE = re.compile(r'(?:query|mutation|subscription)\s+(\w+)')
+
+# Request/response events are sent to the web UI in batches
+_EMIT_INTERVAL = 0.05  # Seconds between batch flushes
+_EMIT_BATCH_MAX = 200  # Flush immediately once this many events are queued
+
+# Per-request fields in CSV export order
+_REQUEST_COLUMNS = (
+    'timestamp', 'method', 'url', 'resource_type',
+    'status', 'status_text', 'duration_ms', 'size_kb',
+    'graphql_query_id', 'graphql_endpoint', 'post_data',
+)
+
+# Per-request fields in spool order, with exact duration (seconds) and size (bytes) as served by /logs
+_SPOOL_COLUMNS = (
+    'timestamp', 'method', 'url', 'resource_type',
+    'status', 'status_text', 'duration', 'size',
+    'graphql_query_id', 'graphql_operation', 'post_data',
+)
+_DURATION_COL = _SPOOL_COLUMNS.index('duration')
+_SIZE_COL = _SPOOL_COLUMNS.index('size')
+
+@dataclass(slots=True)
+class RequestRecord:
+    """One captured request, with fields in _SPOOL_COLUMNS order"""
+    timestamp_ns: int  # Formatted as ISO only when written out
+    method: str
+    url: str
+    resource_type: str
+    status: Optional[int]
+    status_text: Optional[str]
+    duration: float
+    size: int
+    graphql_query_id: str
+    graphql_operation: str
+    post_data: str
+
+    def to_row(self) -> tuple:
+        """Build the spool CSV row for this request"""
+        return (
+            datetime.fromtimestamp(self.timestamp_ns / 1e9).isoformat(), self.method, self.url, self.resource_type,
+            self.status, self.status_text, self.duration, self.size,
+            self.graphql_query_id, self.graphql_operation, self.post_data,
+        )
+
+# Captured requests are streamed to this file by a background writer thread
+_SPOOL_PATH = os.path.join('reports', '.spool', 'network_log.csv')
+_WRITER_BATCH = 256  # Max rows written per flush
+_WRITER_FLUSH_INTERVAL = 0.1  # Max seconds a row waits for its batch to fill
+
+# POST bodies longer than this are parsed every time instead of being kept in the cache
+_GQL_CACHE_MAX_LEN = 4096
+
+def _parse_gql_uncached(post_data: str) -> Tuple[str, str]:
+    """Parse GraphQL query ID and operation name from POST data"""
+    graphql_operation = ''
+    graphql_query_id = ''
+
+    try:
+        post_json = orjson.loads(post_data)
+
+        # Extract query ID from 'id' field (persisted queries)
+        graphql_query_id = post_json.get('id') or post_json.get('queryId') or post_json.get('query_id') or ''
+
+        # Extract operation name
+        # Priority 1: Use the id field if available
+        graphql_operation = graphql_query_id
+
+        # Priority 2: If no id, extract operation name from query string
+        if not graphql_operation and 'query' in post_json:
+            query_string = post_json.get('query', '')
+            match = _OP_RE.search(query_string)
+            if match:
+                graphql_operation = match.group(1)
+
+    except (orjson.JSONDecodeError, AttributeError):
+        pass
+
+    return graphql_query_id, graphql_operation
+
+# Paginated GraphQL traffic repeats the same POST bodies many times per session
+_parse_gql_cached = functools.lru_cache(maxsize=2048)(_parse_gql_uncached)
+
+def _parse_gql(post_data: str) -> Tuple[str, str]:
+    """Parse GraphQL query ID and operation name, caching only small POST bodies"""
+    if len(post_data) > _GQL_CACHE_MAX_LEN:
+        return _parse_gql_uncached(post_data)
+    return _parse_gql_cached(post_data)
+
+def _request_duration(request: Request) -> float:
+    """Get request duration in seconds from Playwright's resource timing"""
+    # Timing values are milliseconds relative to startTime, or -1 when unavailable;
+    # responseEnd is only set once the body has finished loading
+    timing = request.timing
+    end = timing['responseEnd'] if timing['responseEnd'] >= 0 else timing['responseStart']
+    if end < 0:
+        return 0
+    start = max(timing['requestStart'], 0)
+    return max(end - start, 0) / 1000.0
+
+def _write_report_meta(filepath: str, rows: int, file_stat: os.stat_result = None):
+    """Record a report's row count in a sidecar file so /reports doesn't have to rescan it"""
+    if file_stat is None:
+        file_stat = os.stat(filepath)
+    with open(filepath + '.meta.json', 'w', encoding='utf-8') as f:
+        json.dump({'rows': rows, 'size': file_stat.st_size, 'mtime': file_stat.st_mtime}, f)
+
+def _report_row_count(filepath: str, file_stat: os.stat_result) -> int:
+    """Get the row count of a CSV report, preferring its sidecar metadata"""
+    try:
+        with open(filepath + '.meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        # Sidecar is only valid while the CSV is unchanged
+        if meta.get('size') == file_stat.st_size and meta.get('mtime') == file_stat.st_mtime:
+            return meta['rows']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Cache miss: count rows and persist the result
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            row_count = sum(1 for _ in f) - 1  # Exclude header
+    except:
+        return 0
+
+    try:
+        _write_report_meta(filepath, row_count, file_stat)
+    except OSError:
+        pass
+
+    return row_count
+
+# Report files may only be served from these directories
+REPORTS_ROOT = os.path.realpath('reports')
+_REPORT_DIRS = frozenset({
+    os.path.join(REPORTS_ROOT, 'network_logs'),
+    os.path.join(REPORTS_ROOT, 'web_vitals'),
+})
+
+def _safe_report_path(filepath: str):
+    """Resolve a path relative to reports/, or None unless it is a CSV in a report directory"""
+    full_path = os.path.realpath(os.path.join(REPORTS_ROOT, filepath))
+    if full_path.endswith('.csv') and os.path.dirname(full_path) in _REPORT_DIRS:
+        return full_path
+    return None
+
+# Reports larger than this are re-read on every request instead of being cached
+_CSV_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+def _read_csv_json(filepath: str) -> bytes:
+    """Load a CSV report as a serialized JSON payload of column names and row lists"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        rows = list(reader)
+    return orjson.dumps({'columns': columns, 'rows': rows, 'total': len(rows)})
+
+# Reports are immutable once written, so parsed JSON is reusable until mtime/size change;
+# with the size cap the cache holds at most ~8 small reports' worth of JSON
+@functools.lru_cache(maxsize=8)
+def _cached_csv_json(filepath: str, mtime_ns: int, size: int) -> bytes:
+    return _read_csv_json(filepath)
+
+def _load_csv_json(filepath: str, mtime_ns: int, size: int) -> bytes:
+    """Load a CSV report as JSON, caching only reports under _CSV_CACHE_MAX_BYTES"""
+    if size > _CSV_CACHE_MAX_BYTES:
+        return _read_csv_json(filepath)
+    return _cached_csv_json(filepath, mtime_ns, size)
+
+def _list_reports(category: str) -> List[Dict]:
+    """List the CSV reports in reports/<category> for the reports page"""
+    reports_list = []
+    try:
+        # is_file() comes from the directory listing on most platforms; the single
+        # entry.stat() (a stat() syscall on POSIX) is reused for the size, mtime and
+        # sidecar check, so each CSV costs one stat plus at most one sidecar open
+        with os.scandir(os.path.join('reports', category)) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.csv') or not entry.is_file():
+                    continue
+
+                file_stat = entry.stat()
+                reports_list.append({
+                    'filename': entry.name,
+                    'path': os.path.join(category, entry.name),  # For file operations
+                    'size': round(file_stat.st_size / 1024, 2),  # KB
+                    'modified': datetime.fromtimestamp(file_stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+                    'rows': _report_row_count(entry.path, file_stat)
+                })
+    except FileNotFoundError:
+        pass
+
+    return reports_list
+
 class NetworkLoggerWeb:
     def __init__(self):
-        self.requests: List[Dict] = []
+        self.request_count = 0  # Captured requests; the rows themselves live in the spool file
         self.web_vitals: List[Dict] = []  # Store Web Vitals metrics
         self.is_logging = False
-        self.request_start_times: Dict[str, float] = {}
         self.browser = None
         self.page = None
         self.playwright = None
         self.context = None
         self.is_running = False  # Track if a session is already running
+        self._emit_queue: List[Tuple[str, Dict]] = []  # Pending (event, payload) pairs for the web UI
+        self._emit_lock = threading.Lock()
+        self._emit_timer = None
+        self._client_count = 0  # Connected web UI clients
+        self._row_q: queue.Queue = queue.Queue()  # RequestRecords waiting for the spool writer thread
+        self._spool_file = None
+        self._spool_writer = None
+        self._spool_rows = 0  # Rows written to the spool so far
+        self._spool_lock = threading.Lock()
+        self._body_tasks: Set[asyncio.Task] = set()  # Body-size fallbacks still running (keeps them referenced)
+
+    def _queue_emit(self, event: str, payload: Dict):
+        """Queue a Socket.IO event to be sent with the next batch"""
+        # Nobody is watching; captured rows still reach the spool for /logs and export
+        if not self._client_count:
+            return
 
-    def _extract_request_data(self, request: Request, response: Response = None, duration: float = 0, size: int = 0) -> Dict:
-        """Extract relevant data from request and response"""
-        timestamp = datetime.now().isoformat()
+        flush_now = False
+        with self._emit_lock:
+            self._emit_queue.append((event, payload))
+            if len(self._emit_queue) >= _EMIT_BATCH_MAX:
+                flush_now = True
+            elif self._emit_timer is None:
+                self._emit_timer = threading.Timer(_EMIT_INTERVAL, self._flush_emits)
+                self._emit_timer.daemon = True
+                self._emit_timer.start()
+
+        if flush_now:
+            self._flush_emits()
+
+    def _flush_emits(self):
+        """Send all queued events to the web UI as a single 'batch' event"""
+        with self._emit_lock:
+            events, self._emit_queue = self._emit_queue, []
+            if self._emit_timer is not None:
+                self._emit_timer.cancel()
+                self._emit_timer = None
+
+        if events:
+            socketio.emit('batch', events)
+
+    def _open_spool(self):
+        """Open the spool CSV and start its writer thread (once per process)"""
+        if self._spool_file is not None:
+            return
+
+        os.makedirs(os.path.dirname(_SPOOL_PATH), exist_ok=True)
+        self._spool_file = open(_SPOOL_PATH, 'w', newline='', encoding='utf-8')
+        self._spool_writer = csv.writer(self._spool_file)
+        self._spool_writer.writerow(_SPOOL_COLUMNS)
+        self._spool_file.flush()
+
+        thread = threading.Thread(target=self._csv_writer_loop)
+        thread.daemon = True
+        thread.start()
+
+    def _csv_writer_loop(self):
+        """Drain queued rows into the spool CSV in batches"""
+        while True:
+            rows = [self._row_q.get()]
+            deadline = time.monotonic() + _WRITER_FLUSH_INTERVAL
+            while len(rows) < _WRITER_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(self._row_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                with self._spool_lock:
+                    # Timestamps are formatted here, off the capture path
+                    self._spool_writer.writerows(record.to_row() for record in rows)
+                    self._spool_file.flush()
+                    self._spool_rows += len(rows)
+            except Exception as e:
+                print(f"Error writing network log rows: {e}")
+            finally:
+                for _ in rows:
+                    self._row_q.task_done()
+
+    def _sync_spool(self):
+        """Wait until every queued row has been written to the spool CSV"""
+        self._row_q.join()
+
+    def get_requests(self) -> List[Dict]:
+        """Read captured requests back from the spool CSV"""
+        if self._spool_file is None:
+            return []
+
+        self._sync_spool()
+        with self._spool_lock:
+            with open(_SPOOL_PATH, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                next(reader, None)  # Skip header
+                requests = [dict(zip(_SPOOL_COLUMNS, row)) for row in reader]
+
+        # CSV stores everything as text; restore the numeric fields
+        for req in requests:
+            req['status'] = int(req['status']) if req['status'] else None
+            req['duration'] = float(req['duration'])
+            req['size'] = int(req['size'])
+        return requests
+
+    def _extract_request_data(self, request: Request, response: Response = None, duration: float = 0, size: int = 0):
+        """Extract relevant data from request and response and queue it for the spool writer"""
+        timestamp_ns = time.time_ns()
 
-        headers = request.headers
         status = response.status if response else None
         status_text = response.status_text if response else None
-        response_headers = response.headers if response else {}
 
         # Extract GraphQL operation name and query ID
         graphql_operation = ''
         graphql_query_id = ''
 
-        # Check if this looks like a GraphQL request
-        if 'graphql' in request.url.lower() or request.resource_type in ['fetch', 'xhr']:
-            # Try to parse GraphQL operation from POST data
-            if request.post_data:
-                try:
-                    post_json = json.loads(request.post_data)
-
-                    # Extract query ID from 'id' field (persisted queries)
-                    graphql_query_id = post_json.get('id') or post_json.get('queryId') or post_json.get('query_id') or ''
+        # Check if this looks like a GraphQL request; requests without a body have nothing to parse
+        post_data = request.post_data
+        if post_data and (_GQL_URL_RE.search(request.url) is not None or request.resource_type in _XHR_TYPES):
+            graphql_query_id, graphql_operation = _parse_gql(post_data)
 
-                    # Extract operation name
-                    # Priority 1: Use the id field if available
-                    graphql_operation = graphql_query_id
-
-                    # Priority 2: If no id, extract operation name from query string
-                    if not graphql_operation and 'query' in post_json:
-                        query_string = post_json.get('query', '')
-                        # Match pattern: query/mutation/subscription OperationName
-                        match = re.search(r'(?:query|mutation|subscription)\s+(\w+)', query_string)
-                        if match:
-                            graphql_operation = match.group(1)
-
-                except (json.JSONDecodeError, AttributeError):
-                    pass
-
-        data = {
-            'timestamp': timestamp,
-            'method': request.method,
-            'url': request.url,
-            'resource_type': request.resource_type,
-            'status': status,
-            'status_text': status_text,
-            'duration': duration,
-            'size': size,
-            'graphql_query_id': graphql_query_id,
-            'graphql_operation': graphql_operation,
-            'request_headers': json.dumps(headers),
-            'response_headers': json.dumps(response_headers),
-            'post_data': request.post_data if request.post_data else '',
-        }
-
-        return data
+        # Stored exactly; converted to export units (ms, KB) by export_to_csv
+        self._row_q.put(RequestRecord(
+            timestamp_ns, request.method, request.url, request.resource_type,
+            status, status_text, duration, size,
+            graphql_query_id, graphql_operation,
+            post_data or '',
+        ))
+        self.request_count += 1
 
     async def start_logging(self):
         """Start browser session and begin logging network activity"""
@@ -97,6 +378,7 @@ class NetworkLoggerWeb:
 
         self.is_running = True
         self.is_logging = True
+        self._open_spool()
 
         try:
             # Start playwright - keep it alive
@@ -232,42 +514,54 @@ class NetworkLoggerWeb:
                 })();
             """)
 
-            async def handle_request(request: Request):
+            # Handlers are plain functions so Playwright calls them inline; only the
+            # body-size fallback needs a task. Untracked resources return immediately.
+            def handle_request(request: Request):
                 if self.is_logging:
-                    if request.resource_type in ['fetch', 'xhr', 'script', 'document']:
-                        self.request_start_times[request.url] = time.time()
-                        socketio.emit('request', {
+                    if request.resource_type in _TRACKED_TYPES:
+                        self._queue_emit('request', {
                             'type': request.resource_type.upper(),
                             'method': request.method,
                             'url': request.url
                         })
 
-            async def handle_response(response: Response):
+            def record_response(response: Response, duration: float, size: int):
+                request = response.request
+                self._extract_request_data(request, response, duration, size)
+
+                # Emit to web UI (convert duration to milliseconds)
+                self._queue_emit('response', {
+                    'duration': f"{duration * 1000:.2f}",
+                    'size': size,
+                    'url': request.url,
+                    'status': response.status
+                })
+
+            async def record_response_with_body(response: Response, duration: float):
+                size = 0
+                try:
+                    body = await response.body()
+                    size = len(body)
+                except Exception:
+                    pass
+                record_response(response, duration, size)
+
+            def handle_response(response: Response):
                 if self.is_logging:
                     request = response.request
-                    if request.resource_type in ['fetch', 'xhr', 'script', 'document']:
-                        duration = 0
-                        if request.url in self.request_start_times:
-                            duration = time.time() - self.request_start_times[request.url]
-                            del self.request_start_times[request.url]
-
-                        size = 0
-                        try:
-                            body = await response.body()
-                            size = len(body)
-                        except Exception:
-                            pass
-
-                        data = self._extract_request_data(request, response, duration, size)
-                        self.requests.append(data)
-
-                        # Emit to web UI (convert duration to milliseconds)
-                        socketio.emit('response', {
-                            'duration': f"{duration * 1000:.2f}",
-                            'size': size,
-                            'url': request.url,
-                            'status': response.status
-                        })
+                    if request.resource_type in _TRACKED_TYPES:
+                        # Measured now, so the body fallback doesn't report download time instead
+                        duration = _request_duration(request)
+
+                        # Prefer the advertised Content-Length over transferring the whole body
+                        content_length = response.headers.get('content-length')
+                        size = int(content_length) if content_length and content_length.isdigit() else 0
+                        if size == 0 and request.resource_type in _XHR_TYPES:
+                            task = asyncio.ensure_future(record_response_with_body(response, duration))
+                            self._body_tasks.add(task)
+                            task.add_done_callback(self._body_tasks.discard)
+                        else:
+                            record_response(response, duration, size)
 
             self.page.on('request', handle_request)
             self.page.on('response', handle_response)
@@ -314,7 +608,8 @@ class NetworkLoggerWeb:
             self.page = None
             self.is_logging = False
             self.is_running = False
-            socketio.emit('status', {'message': f'Logging stopped. Captured {len(self.requests)} requests.'})
+            self._flush_emits()
+            socketio.emit('status', {'message': f'Logging stopped. Captured {self.request_count} requests.'})
 
     def export_to_csv(self, filename: str = None, prefix: str = None):
         """Export captured network logs to CSV file
@@ -323,7 +618,7 @@ class NetworkLoggerWeb:
             filename: Optional full filename (overrides prefix)
             prefix: Optional prefix to add before NL_ (e.g., 'mytest' -> 'mytest_NL_...')
         """
-        if not self.requests:
+        if not self.request_count:
             return None
 
         if filename is None:
@@ -340,41 +635,36 @@ class NetworkLoggerWeb:
         # Save to reports/network_logs directory
         filepath = os.path.join('reports', 'network_logs', filename)
 
-        fieldnames = [
-            'timestamp', 'method', 'url', 'resource_type',
-            'status', 'status_text', 'duration_ms', 'size_kb',
-            'graphql_query_id', 'graphql_endpoint', 'post_data'
-        ]
-
-        # Convert data to CSV format with proper units
-        csv_data = []
-        for req in self.requests:
-            csv_row = req.copy()
-            # Convert duration from seconds to milliseconds
-            csv_row['duration_ms'] = round(req['duration'] * 1000, 2)
-            # Convert size from bytes to KB
-            csv_row['size_kb'] = round(req['size'] / 1024, 2)
-            # Rename graphql_operation to graphql_endpoint for CSV export
-            csv_row['graphql_endpoint'] = csv_row.pop('graphql_operation', '')
-            # graphql_query_id stays as is
-            # Remove old keys
-            csv_row.pop('duration', None)
-            csv_row.pop('size', None)
-            # Remove verbose fields
-            csv_row.pop('request_headers', None)
-            csv_row.pop('response_headers', None)
-            csv_data.append(csv_row)
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(csv_data)
-
+        # Rows are already on disk; convert the spool to export units once it's caught up
+        self._sync_spool()
+        with self._spool_lock:
+            with open(_SPOOL_PATH, 'r', newline='', encoding='utf-8') as src, \
+                    open(filepath, 'w', newline='', encoding='utf-8') as dst:
+                reader = csv.reader(src)
+                writer = csv.writer(dst)
+                next(reader, None)  # Spool header
+                writer.writerow(_REQUEST_COLUMNS)
+                for row in reader:
+                    # Duration from seconds to milliseconds, size from bytes to KB
+                    row[_DURATION_COL] = round(float(row[_DURATION_COL]) * 1000, 2)
+                    row[_SIZE_COL] = round(int(row[_SIZE_COL]) / 1024, 2)
+                    writer.writerow(row)
+            row_count = self._spool_rows
+
+        _write_report_meta(filepath, row_count)
         return filepath
 
     def clear_logs(self):
         """Clear all captured requests and web vitals"""
-        self.requests.clear()
+        if self._spool_file is not None:
+            self._sync_spool()
+            with self._spool_lock:
+                self._spool_file.seek(0)
+                self._spool_file.truncate()
+                self._spool_writer.writerow(_SPOOL_COLUMNS)
+                self._spool_file.flush()
+                self._spool_rows = 0
+                self.request_count = 0
         self.web_vitals.clear()
 
     def export_web_vitals_to_csv(self, filename: str = None, prefix: str = None):
@@ -403,45 +693,39 @@ class NetworkLoggerWeb:
 
         fieldnames = ['timestamp', 'url', 'metric_name', 'value_ms', 'score', 'rating']
 
-        # Process each vital into separate value_ms and score columns
-        csv_data = []
-        for vital in self.web_vitals:
-            metric_name = vital.get('metric_name', '')
-            value = vital.get('value', 0)
-            rating = vital.get('rating', 'unknown')
-
-            # Format rating with symbols
-            if rating == 'good':
-                rating_text = '✓ Good'
-            elif rating == 'needs-improvement':
-                rating_text = '⚠ Needs Improvement'
-            elif rating == 'poor':
-                rating_text = '✗ Poor'
-            else:
-                rating_text = rating
-
-            row = {
-                'timestamp': vital.get('timestamp', ''),
-                'url': vital.get('url', ''),
-                'metric_name': metric_name,
-                'value_ms': '',  # Default empty
-                'score': '',     # Default empty
-                'rating': rating_text
-            }
-
-            # Populate appropriate column based on metric type
-            if metric_name in ['LCP', 'INP', 'FID']:
-                row['value_ms'] = round(value, 2)
-            elif metric_name == 'CLS':
-                row['score'] = round(value, 4)  # CLS uses more decimal places
-
-            csv_data.append(row)
+        # Process each vital into separate value_ms and score columns, one row at a time
+        def vital_rows():
+            for vital in self.web_vitals:
+                metric_name = vital.get('metric_name', '')
+                value = vital.get('value', 0)
+                rating = vital.get('rating', 'unknown')
+
+                # Format rating with symbols
+                if rating == 'good':
+                    rating_text = '✓ Good'
+                elif rating == 'needs-improvement':
+                    rating_text = '⚠ Needs Improvement'
+                elif rating == 'poor':
+                    rating_text = '✗ Poor'
+                else:
+                    rating_text = rating
+
+                # Populate appropriate column based on metric type (others stay empty)
+                value_ms = ''
+                score = ''
+                if metric_name in ['LCP', 'INP', 'FID']:
+                    value_ms = round(value, 2)
+                elif metric_name == 'CLS':
+                    score = round(value, 4)  # CLS uses more decimal places
+
+                yield (vital.get('timestamp', ''), vital.get('url', ''), metric_name, value_ms, score, rating_text)
 
         with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(csv_data)
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            writer.writerows(vital_rows())
 
+        _write_report_meta(filepath, len(self.web_vitals))
         return filepath
 
 # Global logger instance
@@ -458,7 +742,7 @@ def start_logging():
     if logger.is_running:
         return jsonify({'status': 'error', 'message': 'A logging session is already running'}), 400
 
-    # Run async function in a thread
+    # Playwright needs its own asyncio loop, so the session runs on a dedicated OS thread
     def run_async():
         asyncio.run(logger.start_logging())
 
@@ -472,7 +756,7 @@ def start_logging():
 def stop_logging():
     """Stop logging endpoint"""
     logger.is_logging = False
-    return jsonify({'status': 'stopped', 'total_requests': len(logger.requests)})
+    return jsonify({'status': 'stopped', 'total_requests': logger.request_count})
 
 @app.route('/status', methods=['GET'])
 def get_status():
@@ -480,7 +764,7 @@ def get_status():
     return jsonify({
         'is_running': logger.is_running,
         'is_logging': logger.is_logging,
-        'total_requests': len(logger.requests),
+        'total_requests': logger.request_count,
         'total_vitals': len(logger.web_vitals)
     })
 
@@ -502,7 +786,7 @@ def clear_logs():
 @app.route('/logs', methods=['GET'])
 def get_logs():
     """Get all captured logs"""
-    return jsonify({'logs': logger.requests, 'total': len(logger.requests)})
+    return fast_json({'logs': logger.get_requests(), 'total': logger.request_count})
 
 @app.route('/export-vitals', methods=['GET'])
 def export_vitals():
@@ -516,7 +800,7 @@ def export_vitals():
 @app.route('/vitals', methods=['GET'])
 def get_vitals():
     """Get all captured web vitals"""
-    return jsonify({'vitals': logger.web_vitals, 'total': len(logger.web_vitals)})
+    return fast_json({'vitals': logger.web_vitals, 'total': len(logger.web_vitals)})
 
 @app.route('/reports')
 def reports():
@@ -526,54 +810,8 @@ def reports():
         'web_vitals': []
     }
 
-    # Get network log files
-    network_logs_path = os.path.join('reports', 'network_logs', '*.csv')
-    for file in glob.glob(network_logs_path):
-        file_stat = os.stat(file)
-        # Get just the filename for display, but keep relative path for operations
-        filename = os.path.basename(file)
-        relative_path = os.path.join('network_logs', filename)
-
-        file_info = {
-            'filename': filename,
-            'path': relative_path,  # For file operations
-            'size': round(file_stat.st_size / 1024, 2),  # KB
-            'modified': datetime.fromtimestamp(file_stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-        }
-
-        # Count rows
-        try:
-            with open(file, 'r', encoding='utf-8') as f:
-                row_count = sum(1 for _ in f) - 1  # Exclude header
-                file_info['rows'] = row_count
-        except:
-            file_info['rows'] = 0
-
-        reports_data['network_logs'].append(file_info)
-
-    # Get web vitals files
-    web_vitals_path = os.path.join('reports', 'web_vitals', '*.csv')
-    for file in glob.glob(web_vitals_path):
-        file_stat = os.stat(file)
-        filename = os.path.basename(file)
-        relative_path = os.path.join('web_vitals', filename)
-
-        file_info = {
-            'filename': filename,
-            'path': relative_path,
-            'size': round(file_stat.st_size / 1024, 2),  # KB
-            'modified': datetime.fromtimestamp(file_stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
-        }
-
-        # Count rows
-        try:
-            with open(file, 'r', encoding='utf-8') as f:
-                row_count = sum(1 for _ in f) - 1  # Exclude header
-                file_info['rows'] = row_count
-        except:
-            file_info['rows'] = 0
-
-        reports_data['web_vitals'].append(file_info)
+    for category in reports_data:
+        reports_data[category] = _list_reports(category)
 
     # Sort by modified date (newest first)
     reports_data['network_logs'].sort(key=lambda x: x['modified'], reverse=True)
@@ -584,15 +822,11 @@ def reports():
 @app.route('/view-csv/<path:filepath>')
 def view_csv(filepath):
     """View a CSV file in browser"""
-    # Security: only allow CSV files in reports directory
-    if not filepath.endswith('.csv'):
-        return jsonify({'error': 'Invalid filename'}), 400
-
-    # Ensure path is within reports directory
-    if not filepath.startswith(('network_logs/', 'web_vitals/')):
+    # Security: only allow CSV files in the reports directories
+    full_path = _safe_report_path(filepath)
+    if not full_path:
         return jsonify({'error': 'Invalid path'}), 400
 
-    full_path = os.path.join('reports', filepath)
     if not os.path.exists(full_path):
         return jsonify({'error': 'File not found'}), 404
 
@@ -601,46 +835,36 @@ def view_csv(filepath):
 @app.route('/api/csv-data/<path:filepath>')
 def get_csv_data(filepath):
     """Get CSV data as JSON"""
-    # Security: only allow CSV files in reports directory
-    if not filepath.endswith('.csv'):
-        return jsonify({'error': 'Invalid filename'}), 400
-
-    # Ensure path is within reports directory
-    if not filepath.startswith(('network_logs/', 'web_vitals/')):
+    # Security: only allow CSV files in the reports directories
+    full_path = _safe_report_path(filepath)
+    if not full_path:
         return jsonify({'error': 'Invalid path'}), 400
 
-    full_path = os.path.join('reports', filepath)
     if not os.path.exists(full_path):
         return jsonify({'error': 'File not found'}), 404
 
     try:
-        data = []
-        with open(full_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                data.append(row)
-
-        return jsonify({'data': data, 'total': len(data)})
+        file_stat = os.stat(full_path)
+        blob = _load_csv_json(full_path, file_stat.st_mtime_ns, file_stat.st_size)
+        return app.response_class(blob, mimetype='application/json')  # Already orjson-encoded
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/delete-report/<path:filepath>', methods=['POST'])
 def delete_report(filepath):
     """Delete a CSV report file"""
-    # Security: only allow CSV files in reports directory
-    if not filepath.endswith('.csv'):
-        return jsonify({'error': 'Invalid filename'}), 400
-
-    # Ensure path is within reports directory
-    if not filepath.startswith(('network_logs/', 'web_vitals/')):
+    # Security: only allow CSV files in the reports directories
+    full_path = _safe_report_path(filepath)
+    if not full_path:
         return jsonify({'error': 'Invalid path'}), 400
 
-    full_path = os.path.join('reports', filepath)
     if not os.path.exists(full_path):
         return jsonify({'error': 'File not found'}), 404
 
     try:
         os.remove(full_path)
+        if os.path.exists(full_path + '.meta.json'):
+            os.remove(full_path + '.meta.json')
         filename = os.path.basename(filepath)
         return jsonify({'status': 'success', 'message': f'{filename} deleted successfully'})
     except Exception as e:
@@ -660,24 +884,18 @@ def rename_report():
     if not new_filename.endswith('.csv'):
         new_filename += '.csv'
 
-    # Security: only allow CSV files in reports directory
-    if not old_filepath.endswith('.csv'):
-        return jsonify({'error': 'Invalid old filename'}), 400
-
-    # Ensure path is within reports directory
-    if not old_filepath.startswith(('network_logs/', 'web_vitals/')):
+    # Security: only allow CSV files in the reports directories
+    old_full_path = _safe_report_path(old_filepath)
+    if not old_full_path:
         return jsonify({'error': 'Invalid path'}), 400
 
     # Security: no path characters in new filename
     if '/' in new_filename or '\\' in new_filename:
         return jsonify({'error': 'Invalid new filename - no path characters allowed'}), 400
 
-    old_full_path = os.path.join('reports', old_filepath)
-
-    # Get the directory from old filepath to keep file in same category
-    directory = os.path.dirname(old_filepath)
-    new_filepath = os.path.join(directory, new_filename)
-    new_full_path = os.path.join('reports', new_filepath)
+    # Keep the file in the same category directory
+    new_filepath = os.path.join(os.path.dirname(old_filepath), new_filename)
+    new_full_path = os.path.join(os.path.dirname(old_full_path), new_filename)
 
     # Check old file exists
     if not os.path.exists(old_full_path):
@@ -689,6 +907,8 @@ def rename_report():
 
     try:
         os.rename(old_full_path, new_full_path)
+        if os.path.exists(old_full_path + '.meta.json'):
+            os.rename(old_full_path + '.meta.json', new_full_path + '.meta.json')
         return jsonify({
             'status': 'success',
             'message': f'Renamed to {new_filename}',
@@ -701,15 +921,11 @@ def rename_report():
 @app.route('/download/<path:filepath>')
 def download_file(filepath):
     """Download a CSV file"""
-    # Security: only allow CSV files in reports directory
-    if not filepath.endswith('.csv'):
-        return jsonify({'error': 'Invalid filename'}), 400
-
-    # Ensure path is within reports directory
-    if not filepath.startswith(('network_logs/', 'web_vitals/')):
+    # Security: only allow CSV files in the reports directories
+    full_path = _safe_report_path(filepath)
+    if not full_path:
         return jsonify({'error': 'Invalid path'}), 400
 
-    full_path = os.path.join('reports', filepath)
     if not os.path.exists(full_path):
         return jsonify({'error': 'File not found'}), 404
 
@@ -722,7 +938,13 @@ def download_file(filepath):
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
+    logger._client_count += 1
     emit('status', {'message': 'Connected to Network Logger'})
 
+@socketio.on('disconnect')
+def handle_disconnect():
+    """Handle client disconnection"""
+    logger._client_count = max(logger._client_count - 1, 0)
+
 if __name__ == '__main__':
     socketio.run(app, host='0.0.0.0', port=5001, debug=True, allow_unsafe_werkzeug=True)
@@ -0,0 +1,8 @@
+"""Circle area calculation used by test.py"""
+
+import math
+
+
+def calculate(radius: float) -> float:
+    """Return the area of a circle with the given radius"""
+    return math.pi * radius * radius
@@ -2,167 +2,357 @@
 Network Logger - Captures fetch/XHR/JS network calls and exports to CSV
 
 This script uses Playwright to monitor network activity in a browser session,
-capturing all fetch/XHR/script requests and responses, then exports them to CSV format.
+capturing all fetch/XHR/script requests and responses, and streams them to a CSV file.
 """
 
 import asyncio
 import json
 import csv
+import os
+import sys
 import time
-from datetime import datetime
-from typing import List, Dict
-from playwright.async_api import async_playwright, Request, Response  # type: ignore
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import FrozenSet, List, Optional
+from playwright.async_api import async_playwright, Playwright, Request, Response, Route  # type: ignore
+
+# orjson is much faster at encoding header dicts; stdlib json is the fallback
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _json_dumps = json.dumps
+
+# Resource types that are logged
+_WANTED_RESOURCE_TYPES: FrozenSet[str] = frozenset({'fetch', 'xhr', 'script'})
+
+# Resource types aborted by the browser when block_resources is enabled
+_BLOCKED_RESOURCE_TYPES: FrozenSet[str] = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+# Number of captured rows buffered before they are written to the CSV file
+BATCH_SIZE = 256
+
+# Only these methods carry a request body worth reading
+_POST_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+
+# Low-cardinality row fields (method, resource type, status text) share one string object each
+_INTERN = sys.intern
+
+# Size of the event loop's default thread pool
+_EXECUTOR_WORKERS = 4
+
+# Write buffer for the CSV file, so batches reach the OS in ~1 MiB writes
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# CSV column order; captured rows are tuples in this order
+CSV_FIELDNAMES = [
+    'timestamp', 'method', 'url', 'resource_type',
+    'status', 'status_text', 'duration', 'size',
+    'request_headers', 'response_headers', 'post_data'
+]
+
+
+def _request_duration(request: Request) -> float:
+    """Get request duration in seconds from Chromium's resource timing"""
+    # Timing values are milliseconds relative to startTime, or -1 when unavailable
+    timing = request.timing
+    return max(timing['responseEnd'] - max(timing['requestStart'], 0), 0) / 1000.0
 
 
 class NetworkLogger:
-    def __init__(self):
-        self.requests: List[Dict] = []
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose  # Print every request/response (slows the event loop on busy pages)
+        self.request_count = 0  # Rows captured in the current CSV file
+        self.filename = None  # CSV file the current/last session is written to
         self.is_logging = False
-        self.request_start_times: Dict[str, float] = {}  # Track request start times
+        self._batch: List[Optional[tuple]] = [None] * BATCH_SIZE  # Preallocated slots for rows waiting to be written
+        self._batch_i = 0  # Number of filled slots in _batch
+        self._csv_file = None
+        self._writer = None
+        # Rows carry time.monotonic() timestamps; these anchor them to wall-clock time
+        self._wall_anchor = datetime.now()
+        self._mono_anchor = time.monotonic()
+
+    def _open_csv(self, filename: str = None):
+        """Open the output CSV file and write its header"""
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"network_log_{timestamp}.csv"
+
+        # Ensure .csv extension
+        if not filename.endswith('.csv'):
+            filename += '.csv'
+
+        self.filename = filename
+        self.request_count = 0
+        self._wall_anchor = datetime.now()
+        self._mono_anchor = time.monotonic()
+        self._csv_file = open(filename, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE)
+        self._writer = csv.writer(self._csv_file)
+        self._writer.writerow(CSV_FIELDNAMES)
+
+    def _add_row(self, row: tuple):
+        """Buffer a captured row, writing the batch out once it is full"""
+        self._batch[self._batch_i] = row
+        self._batch_i += 1
+        self.request_count += 1
+        if self._batch_i == BATCH_SIZE:
+            self._flush_batch()
+
+    def _flush_batch(self):
+        """Write buffered rows to the CSV file, formatting their timestamps as ISO"""
+        if self._batch_i and self._writer:
+            wall_anchor = self._wall_anchor
+            mono_anchor = self._mono_anchor
+            self._writer.writerows(
+                ((wall_anchor + timedelta(seconds=row[0] - mono_anchor)).isoformat(),) + row[1:]
+                for row in self._batch[:self._batch_i]
+            )
+        # Slots are overwritten by the next batch rather than cleared
+        self._batch_i = 0
+
+    def _sync_csv(self):
+        """Push written rows through Python's buffer and the OS cache to disk"""
+        self._csv_file.flush()
+        os.fsync(self._csv_file.fileno())
+
+    def _close_csv(self):
+        """Flush remaining rows and close the CSV file (removed again if nothing was captured)"""
+        if self._csv_file is None:
+            return
+
+        self._flush_batch()
+        self._sync_csv()
+        self._csv_file.close()
+        self._csv_file = None
+        self._writer = None
 
-    def _extract_request_data(self, request: Request, response: Response = None, duration: float = 0, size: int = 0) -> Dict:
-        """Extract relevant data from request and response"""
-        timestamp = datetime.now().isoformat()
+        if not self.request_count:
+            os.remove(self.filename)
+            self.filename = None
+
+    def _extract_request_data(self, request: Request, response: Response = None, duration: float = 0, size: int = 0,
+                              failure: str = None) -> tuple:
+        """Extract relevant data from request and response as a row in CSV_FIELDNAMES order"""
+        timestamp = time.monotonic()  # Converted to ISO when the batch is flushed
 
         # Get request headers
         headers = request.headers
+        method = _INTERN(request.method)
+        post_data = (request.post_data or '') if method in _POST_METHODS else ''
 
         # Get response data if available
         status = response.status if response else None
-        status_text = response.status_text if response else None
+        status_text = _INTERN(response.status_text) if response else failure
         response_headers = response.headers if response else {}
 
-        # Calculate timing
-        timing = request.timing if hasattr(request, 'timing') else {}
-
-        data = {
-            'timestamp': timestamp,
-            'method': request.method,
-            'url': request.url,
-            'resource_type': request.resource_type,
-            'status': status,
-            'status_text': status_text,
-            'duration': duration,
-            'size': size,
-            'request_headers': json.dumps(headers),
-            'response_headers': json.dumps(response_headers),
-            'post_data': request.post_data if request.post_data else '',
-        }
-
-        return data
-
-    async def start_logging(self, url: str, headless: bool = False):
+        return (
+            timestamp,
+            method,
+            request.url,
+            _INTERN(request.resource_type),
+            status,
+            status_text,
+            duration,
+            size,
+            _json_dumps(headers),
+            _json_dumps(response_headers),
+            post_data,
+        )
+
+    async def start_logging(self, url: str, headless: bool = False, filename: str = None,
+                            block_resources: bool = False):
         """
         Start browser session and begin logging network activity
 
         Args:
             url: The URL to navigate to (e.g., your login page)
             headless: Whether to run browser in headless mode
+            filename: Output CSV filename (default: network_log_TIMESTAMP.csv)
+            block_resources: Abort image/media/font/stylesheet requests (pages render without them)
         """
         self.is_logging = True
 
-        async with async_playwright() as p:
-            # Launch browser
-            browser = await p.chromium.launch(headless=headless)
-            context = await browser.new_context()
-            page = await context.new_page()
-
-            # Set up network listeners
-            async def handle_request(request: Request):
-                if self.is_logging:
-                    # Capture fetch/XHR/script requests
-                    if request.resource_type in ['fetch', 'xhr', 'script']:
-                        self.request_start_times[request.url] = time.time()
-                        print(f"[REQUEST] {request.resource_type.upper()} {request.method} {request.url}")
-
-            async def handle_response(response: Response):
-                if self.is_logging:
-                    request = response.request
-                    # Capture fetch/XHR/script requests
-                    if request.resource_type in ['fetch', 'xhr', 'script']:
-                        # Calculate duration
-                        duration = 0
-                        if request.url in self.request_start_times:
-                            duration = time.time() - self.request_start_times[request.url]
-                            del self.request_start_times[request.url]
-
-                        # Get response size
-                        size = 0
-                        try:
-                            body = await response.body()
-                            size = len(body)
-                        except Exception:
-                            pass
-
-                        data = self._extract_request_data(request, response, duration, size)
-                        self.requests.append(data)
-                        print(f"{duration:.6f}, {size}")
-
-            # Attach listeners
-            page.on('request', handle_request)
-            page.on('response', handle_response)
-
-            # Navigate to the URL
-            await page.goto(url)
-
-            print(f"\n{'='*60}")
-            print("Network Logger Started")
-            print(f"{'='*60}")
-            print("Browser is now open. Perform your actions.")
-            print("\nTo stop logging and export to CSV:")
-            print("  - Close the browser window")
-            print(f"{'='*60}\n")
-
-            # Wait for the page to close (user closes browser)
-            await page.wait_for_event('close', timeout=0)
-
-            await browser.close()
+        try:
+            await self._run_session(url, headless, filename, block_resources)
+        finally:
+            self.is_logging = False
+            self._close_csv()
 
-        self.is_logging = False
-        print(f"\nLogging stopped. Captured {len(self.requests)} requests.")
+        print(f"\nLogging stopped. Captured {self.request_count} requests.")
+
+    async def _run_session(self, url: str, headless: bool, filename: str = None,
+                           block_resources: bool = False):
+        """Run the browser session, streaming captured rows to CSV until the page is closed"""
+        async with async_playwright() as p:
+            # Event handlers usually return before their first await (not logging, or an
+            # untracked resource type); eager tasks run them inline without a loop tick.
+            # The loop may belong to the caller, so its own task factory is restored
+            # before Playwright shuts down.
+            loop = asyncio.get_running_loop()
+            previous_factory = loop.get_task_factory()
+            if sys.version_info >= (3, 12):
+                loop.set_task_factory(asyncio.eager_task_factory)
+
+            try:
+                await self._run_browser(p, url, headless, filename, block_resources)
+            finally:
+                loop.set_task_factory(previous_factory)
+
+    async def _run_browser(self, p: Playwright, url: str, headless: bool, filename: str = None,
+                           block_resources: bool = False):
+        """Launch the browser and log its network activity until the page is closed"""
+        # Launch browser
+        browser = await p.chromium.launch(headless=headless)
+
+        # Open the output file as soon as the browser is up, named for this session
+        self._open_csv(filename)
+
+        context = await browser.new_context()
+        page = await context.new_page()
+
+        # Drop untracked heavy resources in the browser so they are never downloaded
+        if block_resources:
+            async def handle_route(route: Route):
+                if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            await page.route('**/*', handle_route)
+
+        # Set up network listeners: one event per completed or failed request,
+        # with the response already available
+        async def handle_finished(request: Request):
+            # Untracked types return before any await
+            if not self.is_logging or request.resource_type not in _WANTED_RESOURCE_TYPES:
+                return
+
+            response = await request.response()
+            if response is None:
+                return
+
+            duration = _request_duration(request)
+
+            # Get response size from Content-Length; fall back to the size Chromium recorded
+            content_length = response.headers.get('content-length', '')
+            size = int(content_length) if content_length.isdigit() else 0
+            if size == 0:
+                try:
+                    sizes = await request.sizes()
+                    size = sizes['responseBodySize']
+                except Exception:
+                    pass
+
+            self._add_row(self._extract_request_data(request, response, duration, size))
+            if self.verbose:
+                print(f"[{request.resource_type.upper()}] {request.method} {request.url} {duration:.6f}, {size}")
+
+        async def handle_failed(request: Request):
+            if not self.is_logging or request.resource_type not in _WANTED_RESOURCE_TYPES:
+                return
+
+            duration = _request_duration(request)
+            self._add_row(self._extract_request_data(request, None, duration, 0, failure=request.failure))
+            if self.verbose:
+                print(f"[FAILED] {request.method} {request.url} {request.failure}")
+
+        # Attach listeners
+        page.on('requestfinished', handle_finished)
+        page.on('requestfailed', handle_failed)
+
+        # Navigate to the URL
+        await page.goto(url)
+
+        print(f"\n{'='*60}")
+        print("Network Logger Started")
+        print(f"{'='*60}")
+        print("Browser is now open. Perform your actions.")
+        print("\nTo stop logging and export to CSV:")
+        print("  - Close the browser window")
+        print(f"{'='*60}\n")
+
+        # Wait for the page to close (user closes browser)
+        await page.wait_for_event('close', timeout=0)
+
+        await browser.close()
 
     def export_to_csv(self, filename: str = None):
         """
         Export captured network logs to CSV file
 
+        Rows are already streamed to disk while logging; this only moves the
+        file when a different name is requested.
+
         Args:
-            filename: Output CSV filename (default: network_log_TIMESTAMP.csv)
+            filename: Output CSV filename (default: keep the session's file)
+        """
+        self._flush_csv()
+        return self._write_csv_sync(filename)
+
+    async def export_to_csv_async(self, filename: str = None):
+        """
+        Export captured network logs to CSV file without blocking the event loop
+
+        Args:
+            filename: Output CSV filename (default: keep the session's file)
         """
-        if not self.requests:
+        # The file object is written from the loop thread and isn't thread-safe, so it is
+        # flushed here; the worker only does the fsync and the rename
+        self._flush_csv()
+        return await asyncio.to_thread(self._write_csv_sync, filename)
+
+    def _flush_csv(self):
+        """Write buffered rows and hand Python's file buffer to the OS"""
+        self._flush_batch()
+        if self._csv_file is not None:
+            self._csv_file.flush()
+
+    def _write_csv_sync(self, filename: str = None):
+        """Sync the CSV file to disk and move it to filename if one is given (runs off the loop thread)"""
+        if not self.request_count or not self.filename:
             print("No requests to export.")
             return
 
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"network_log_{timestamp}.csv"
+        csv_file = self._csv_file
+        if csv_file is not None:
+            os.fsync(csv_file.fileno())
 
-        # Ensure .csv extension
-        if not filename.endswith('.csv'):
-            filename += '.csv'
-
-        # Write to CSV
-        fieldnames = [
-            'timestamp', 'method', 'url', 'resource_type',
-            'status', 'status_text', 'duration', 'size',
-            'request_headers', 'response_headers', 'post_data'
-        ]
+        if filename is not None:
+            # Ensure .csv extension
+            if not filename.endswith('.csv'):
+                filename += '.csv'
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(self.requests)
+            if filename != self.filename:
+                # An open file can't be renamed on Windows
+                if csv_file is not None:
+                    print(f"Still logging to {self.filename}; it can be moved once the session ends.")
+                    return self.filename
+                os.replace(self.filename, filename)
+                self.filename = filename
 
-        print(f"\nExported {len(self.requests)} requests to: {filename}")
-        return filename
+        print(f"\nExported {self.request_count} requests to: {self.filename}")
+        return self.filename
 
     def clear_logs(self):
         """Clear all captured requests"""
-        self.requests.clear()
+        self._batch_i = 0
+        if self._csv_file is not None:
+            # Start the open CSV file over
+            self._csv_file.seek(0)
+            self._csv_file.truncate()
+            self._writer.writerow(CSV_FIELDNAMES)
+        self.request_count = 0
         print("Logs cleared.")
 
 
 async def main():
     """Example usage"""
+    # A single browser session needs few worker threads for blocking calls
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=_EXECUTOR_WORKERS))
+
     # Create logger instance
     logger = NetworkLogger()
 
@@ -179,8 +369,14 @@ async def main():
         print(f"Error during logging: {e}")
 
     # Export to CSV
-    logger.export_to_csv()
+    await logger.export_to_csv_async()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional (not available on Windows); fall back to the stdlib loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -1,4 +1,4 @@
-import maxEnv.ipynb.circle_area as circle_area
+import circle_area
 import time
 import sys
 
@@ -1,5 +1,6 @@
 """Simple test to check if Playwright browser can stay open"""
 import asyncio
+import signal
 from playwright.async_api import async_playwright
 
 async def main():
@@ -14,16 +15,27 @@ async def main():
 
     print("Browser opened! Press Ctrl+C to close...")
 
+    # Keep alive until Ctrl+C, without waking the loop while idle
+    stop_event = asyncio.Event()
     try:
-        # Keep alive
-        while True:
-            await asyncio.sleep(1)
-    except KeyboardInterrupt:
-        print("\nClosing browser...")
+        asyncio.get_running_loop().add_signal_handler(signal.SIGINT, stop_event.set)
+    except NotImplementedError:
+        pass  # Windows: Ctrl+C raises KeyboardInterrupt instead
 
-    await browser.close()
-    await playwright.stop()
-    print("Done!")
+    try:
+        await stop_event.wait()
+    finally:
+        # Also runs on Windows, where asyncio.run cancels this task on Ctrl+C
+        print("\nClosing browser...")
+        await browser.close()
+        await playwright.stop()
+        print("Done!")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional (not available on Windows); fall back to the stdlib loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())